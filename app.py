@@ -2,7 +2,7 @@ import os
 import sys
 from typing import List, Tuple
 
-from cli import run_cli
+from cli import run_cli, run_console
 from serial_manager import SerialManager
 from workers.serial_utils import find_default_port, open_serial
 from workers.serial_worker_simon_says import SOUND_HOOKS, SimonSaysWorker
@@ -18,6 +18,7 @@ def parse_device_specs(arg: str | None) -> List[Tuple[str, str, str | None]]:
       - "game:serial:COM4" -> device id "game", serial worker on COM4
       - "escape1:EscapeRoom:COM5" -> device id "escape1", EscapeRoom worker on COM5
       - "dummy1:dummy" -> device id "dummy1" using dummy worker
+      - "load1:dummy:rate=2000;burst=50" -> dummy worker generating load (see parse_load_spec)
     Multiple specs separated by commas.
     """
     specs: List[Tuple[str, str, str | None]] = []
@@ -30,7 +31,8 @@ def parse_device_specs(arg: str | None) -> List[Tuple[str, str, str | None]]:
         token = token.strip()
         if not token:
             continue
-        parts = token.split(":")
+        # the third field keeps its colons (dummy load specs may contain tokens like SIMON:FAIL)
+        parts = token.split(":", 2)
         if len(parts) == 1:
             # port only, use default id later
             port = parts[0]
@@ -54,21 +56,30 @@ def parse_device_specs(arg: str | None) -> List[Tuple[str, str, str | None]]:
 def parse_args():
     # CLI: python app.py [device_specs]
     # Web: python app.py web [device_specs]
+    # Console (all devices): python app.py console [device_specs] [--replay commands.txt]
     args = sys.argv[1:]
     mode = "cli"
     device_arg: str | None = None
-    if args and args[0].lower() == "web":
-        mode = "web"
+    replay_path: str | None = None
+    if "--replay" in args:
+        idx = args.index("--replay")
+        if idx + 1 >= len(args):
+            raise SystemExit("--replay needs a file")
+        replay_path = args[idx + 1]
+        del args[idx : idx + 2]
+    if args and args[0].lower() in ("web", "console"):
+        mode = args[0].lower()
         args = args[1:]
     if args:
         device_arg = args[0]
-    return mode, device_arg
+    return mode, device_arg, replay_path
 
 
 def main():
-    mode, device_arg = parse_args()
+    mode, device_arg, replay_path = parse_args()
     specs = parse_device_specs(device_arg)
     print("Device spec format: <id>:<worker>[:port], worker in {serial,dummy}; comma-separated for multiples.")
+    print("Dummy load spec in place of port: rate=N;burst=N;mix=READY*5+FAIL;size=N;jitter=F")
     print("Devices:")
     for dev_id, worker_type, port in specs:
         port_info = port or "n/a"
@@ -82,6 +93,12 @@ def main():
             app.run(host="0.0.0.0", port=FLASK_DEFAULT_PORT, debug=False)
         finally:
             manager.close_all()
+    elif mode == "console":
+        manager = SerialManager(specs, sound_hooks=SOUND_HOOKS, echo_to_console=False)
+        try:
+            run_console(manager, replay_path)
+        finally:
+            manager.close_all()
     else:
         # CLI mode uses first device only
         first = specs[0]
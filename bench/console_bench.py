@@ -0,0 +1,53 @@
+"""
+Console output throughput: the reader threads' per-line flushed print against
+cli.ConsoleWriter batching (one write per flush interval).
+
+    python bench/console_bench.py [lines] [batch]
+
+Writes to a real file descriptor (os.devnull) so each flush is an actual syscall.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cli import ConsoleWriter  # noqa: E402
+
+TOKENS = ["SIMON:READY", "SIMON:ARMED", "SIMON:FAIL", "SIMON:WIN"]
+
+
+def per_line_print(stream, lines: int) -> float:
+    started = time.perf_counter()
+    for i in range(lines):
+        line = TOKENS[i % len(TOKENS)]
+        print(f"\nESP32: {line}\n> ", end="", flush=True, file=stream)
+    return time.perf_counter() - started
+
+
+def batched(stream, lines: int, batch: int) -> float:
+    # flushing every `batch` lines keeps the cap from suppressing anything, so both paths write everything
+    writer = ConsoleWriter(stream, max_lines=batch)
+    started = time.perf_counter()
+    for i in range(lines):
+        writer.write(f"[SimonSays] ESP32: {TOKENS[i % len(TOKENS)]}", "SimonSays")
+        if (i + 1) % batch == 0:
+            writer.flush()
+    writer.flush()
+    return time.perf_counter() - started
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    batch = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    with open(os.devnull, "w", buffering=1) as stream:
+        t_print = per_line_print(stream, lines)
+        t_batch = batched(stream, lines, batch)
+    print(f"{lines} lines")
+    print(f"per-line print + flush : {t_print * 1000:9.1f} ms  {lines / t_print:12.0f} lines/s")
+    print(f"batched ({batch:>4}/flush)   : {t_batch * 1000:9.1f} ms  {lines / t_batch:12.0f} lines/s")
+    print(f"speedup                : {t_print / t_batch:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
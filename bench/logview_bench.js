@@ -0,0 +1,66 @@
+// Browser-free benchmark for the dashboard log rendering.
+// Compares the old split/slice/join of the whole <pre> text per event against
+// LogModel + computeWindow, which only formats the rows that are on screen.
+//
+//   node bench/logview_bench.js [events] [batch] [scrollback]
+
+const { LogModel, computeWindow, formatLine } = require("../static/logview.js");
+
+const EVENTS = parseInt(process.argv[2] || "20000", 10);
+const BATCH = parseInt(process.argv[3] || "5", 10);
+const SCROLLBACK = parseInt(process.argv[4] || "5000", 10);
+const ROW_HEIGHT = 18;
+const VIEWPORT = 600;
+
+const TOKENS = ["SIMON:READY", "SIMON:ARMED", "SIMON:FAIL", "SIMON:WIN", "ESCAPE:READY"];
+const DEVICES = ["SimonSays", "EscapeRoom", "dummy1"];
+
+function makeBatch(n, base) {
+  const out = [];
+  for (let i = 0; i < n; i++) {
+    const k = base + i;
+    out.push({ id: k, device: DEVICES[k % DEVICES.length], src: "ESP32", text: TOKENS[k % TOKENS.length] });
+  }
+  return out;
+}
+
+// what updateMessages used to do, with a plain object standing in for the <pre>
+function legacy(maxLines) {
+  const log = { textContent: "" };
+  return (msgs) => {
+    const lines = log.textContent ? log.textContent.split("\n") : [];
+    msgs.forEach((m) => lines.push(formatLine(m)));
+    log.textContent = lines.slice(-maxLines).join("\n");
+  };
+}
+
+// model update plus the string work renderLog does for one frame
+function virtualized(capacity, deviceFilter) {
+  const model = new LogModel(capacity);
+  model.setDeviceFilter(deviceFilter);
+  let rendered = "";
+  return (msgs) => {
+    msgs.forEach((m) => model.push(m));
+    const total = model.count();
+    const scrollTop = Math.max(0, total * ROW_HEIGHT - VIEWPORT);
+    const win = computeWindow(scrollTop, VIEWPORT, ROW_HEIGHT, total);
+    rendered = model.lines(win.start, win.end).join("\n");
+    return rendered;
+  };
+}
+
+function run(name, update) {
+  const batches = [];
+  for (let i = 0; i < EVENTS; i += BATCH) batches.push(makeBatch(BATCH, i));
+  const started = process.hrtime.bigint();
+  batches.forEach((b) => update(b));
+  const ms = Number(process.hrtime.bigint() - started) / 1e6;
+  const perEvent = (ms * 1000) / batches.length;
+  console.log(`${name.padEnd(34)} ${ms.toFixed(1).padStart(9)} ms  ${perEvent.toFixed(2).padStart(8)} us/event`);
+}
+
+console.log(`${EVENTS} messages in batches of ${BATCH}, scrollback ${SCROLLBACK}`);
+run("legacy pre rewrite (400 lines)", legacy(400));
+run(`legacy pre rewrite (${SCROLLBACK} lines)`, legacy(SCROLLBACK));
+run(`virtualized (${SCROLLBACK} lines)`, virtualized(SCROLLBACK, ""));
+run(`virtualized + device filter`, virtualized(SCROLLBACK, DEVICES[0]));
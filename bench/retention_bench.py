@@ -0,0 +1,85 @@
+"""
+Memory per retained message: plain dicts holding freshly decoded strings (the
+old _append_message) against workers.retention with token interning, and what
+the search index adds on top of that.
+
+    python bench/retention_bench.py [messages]
+
+Measured with tracemalloc over the retained list only.
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from message_index import MessageIndex  # noqa: E402
+from workers.retention import ByteBudget, InternTable, Retention  # noqa: E402
+
+TOKENS = [b"SIMON:READY\n", b"SIMON:ARMED\n", b"SIMON:FAIL\n", b"SIMON:WIN\n", b"ESCAPE:ARMED\n"]
+
+
+def readlines(n: int):
+    # same as the reader loop: a new str per line, even for repeated tokens
+    for i in range(n):
+        yield TOKENS[i % len(TOKENS)].decode("utf-8", errors="replace").strip()
+
+
+def measure(build):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(s.size_diff for s in after.compare_to(before, "filename"))
+    return size, kept
+
+
+def before(n: int):
+    def build():
+        messages = []
+        for i, line in enumerate(readlines(n), 1):
+            messages.append({"id": i, "src": "ESP32", "text": line, "ts": time.time()})
+        return messages
+
+    return measure(build)
+
+
+def after(n: int, indexed: bool = False):
+    def build():
+        interns = InternTable()
+        retention = Retention(n, max_bytes=1 << 40, budget=ByteBudget(1 << 40), interns=interns)
+        index = MessageIndex() if indexed else None
+        if index:
+            # wired up like SerialManager does
+            retention.index_size = index.doc_size
+        messages = []
+        # "ESP32" as read back from a line, not the source literal
+        src = b"ESP32".decode()
+        for i, line in enumerate(readlines(n), 1):
+            msg = retention.make_message(i, src, line, time.time())
+            retention.add(messages, msg)
+            if index:
+                index.add("dev", msg, messages[0]["id"])
+        return messages, retention, index
+
+    return measure(build)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    old_bytes, _ = before(n)
+    new_bytes, (_, retention, _) = after(n)
+    indexed_bytes, (_, indexed_retention, index) = after(n, indexed=True)
+    print(f"{n} messages")
+    print(f"plain dict + decoded str : {old_bytes / n:7.1f} bytes/message")
+    print(f"interned + retention     : {new_bytes / n:7.1f} bytes/message (incl. size bookkeeping)")
+    print(f"retention's own estimate : {retention.used / n:7.1f} bytes/message")
+    print(f"search index             : {(indexed_bytes - new_bytes) / n:7.1f} bytes/message")
+    print(f"index's own estimate     : {index.stats()['bytes'] / n:7.1f} bytes/message")
+    print(f"total charged to budget  : {indexed_retention.budget.used / n:7.1f} bytes/message")
+
+
+if __name__ == "__main__":
+    main()
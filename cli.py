@@ -1,5 +1,17 @@
+import queue
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, TextIO
+
+from serial_manager import SerialManager
 from workers.serial_worker_simon_says import SimonSaysWorker as SerialWorker
 
+FLUSH_INTERVAL = 0.1
+MAX_LINES_PER_FLUSH = 50
+PROMPT = "> "
+
 
 def run_cli(worker: SerialWorker):
     worker.start()
@@ -12,3 +24,177 @@ def run_cli(worker: SerialWorker):
             worker.send_line(cmd)
         except KeyboardInterrupt:
             break
+
+
+class ConsoleWriter:
+    """
+    Collects console lines and writes them in one call per flush instead of one
+    flushed print per line. At most max_lines are shown per flush; the rest are
+    summarised per device so a burst can't flood the terminal.
+    """
+
+    def __init__(self, stream: TextIO = sys.stdout, max_lines: int = MAX_LINES_PER_FLUSH, prompt: str = PROMPT):
+        self.stream = stream
+        self.max_lines = max_lines
+        self.prompt = prompt
+        self.lines: List[str] = []
+        self.suppressed: Counter = Counter()
+        self.written = 0
+        self.dropped = 0
+
+    def write(self, line: str, device: str = ""):
+        if len(self.lines) < self.max_lines:
+            self.lines.append(line)
+        else:
+            self.suppressed[device] += 1
+
+    def flush(self):
+        if not self.lines and not self.suppressed:
+            return
+        self.written += len(self.lines)
+        out = self.lines
+        if self.suppressed:
+            summary = ", ".join(f"{dev or 'console'}: {n}" for dev, n in self.suppressed.items())
+            out.append(f"... {sum(self.suppressed.values())} lines not shown ({summary})")
+            self.dropped += sum(self.suppressed.values())
+        self.stream.write("\r" + "\n".join(out) + "\n" + self.prompt)
+        self.stream.flush()
+        self.lines = []
+        self.suppressed = Counter()
+
+
+class Console:
+    """
+    Multi-device console on top of SerialManager.
+
+    Commands are routed by an "@device" prefix:
+      SIMON:ARM            -> current device
+      @EscapeRoom          -> make EscapeRoom the current device
+      @EscapeRoom CMD      -> send CMD to EscapeRoom only
+      @all CMD             -> send CMD to every device
+      /devices, /stats, /quit
+    """
+
+    def __init__(self, manager: SerialManager, writer: Optional[ConsoleWriter] = None):
+        self.manager = manager
+        self.writer = writer or ConsoleWriter()
+        self.current = manager.list_devices()[0] if manager.list_devices() else None
+        self.last_ids: Dict[str, int] = {}
+        self.gaps = 0
+        self.commands: "queue.Queue[Optional[str]]" = queue.Queue()
+        self.running = False
+        # command lines handed to devices (an @all line counts once)
+        self.sent = 0
+
+    def route(self, line: str) -> bool:
+        """Handle one command line; returns False when the console should exit."""
+        line = line.strip()
+        if not line or line.startswith("#"):
+            return True
+        if line == "/quit":
+            return False
+        if line == "/devices":
+            for dev in self.manager.list_devices():
+                marker = "*" if dev == self.current else " "
+                self.writer.write(f"{marker} {dev}")
+            return True
+        if line == "/stats":
+            self.writer.write(f"shown {self.writer.written}, not shown {self.writer.dropped}, missed {self.gaps}")
+            return True
+        if line.startswith("@"):
+            target, _, cmd = line[1:].partition(" ")
+            cmd = cmd.strip()
+            if target == "all":
+                targets = self.manager.list_devices()
+            elif target in self.manager.workers:
+                targets = [target]
+            else:
+                self.writer.write(f"(Unknown device {target}, try /devices)")
+                return True
+            if not cmd:
+                if target != "all":
+                    self.current = target
+                return True
+            for dev in targets:
+                self.manager.workers[dev].send_line(cmd)
+            self.sent += 1
+            return True
+        if self.current is None:
+            self.writer.write("(No devices)")
+            return True
+        self.manager.workers[self.current].send_line(line)
+        self.sent += 1
+        return True
+
+    def replay(self, path: str) -> bool:
+        """
+        Send every command in a file back-to-back, without waiting for replies.
+        Returns False when the file ends the console with /quit.
+        """
+        keep_running = True
+        sent_before = self.sent
+        started = time.perf_counter()
+        try:
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if not self.route(line):
+                        keep_running = False
+                        break
+        except OSError as e:
+            self.writer.write(f"(Could not replay {path}: {e})")
+            return True
+        elapsed = time.perf_counter() - started
+        count = self.sent - sent_before
+        rate = count / elapsed if elapsed > 0 else 0.0
+        self.writer.write(f"(Replayed {count} commands from {path} in {elapsed * 1000:.1f} ms, {rate:.0f} commands/s)")
+        return keep_running
+
+    def pump_messages(self):
+        # ids are consecutive per device, so a jump means the worker's buffer rolled over between polls
+        seen = {dev: i for dev, i in self.last_ids.items() if i > 0}
+        msgs, self.last_ids = self.manager.get_messages_since(self.last_ids)
+        for m in msgs:
+            dev = m["device"]
+            prev = seen.get(dev)
+            if prev is not None and m["id"] > prev + 1:
+                self.gaps += m["id"] - prev - 1
+            seen[dev] = m["id"]
+            self.writer.write(f"[{dev}] {m['src']}: {m['text']}", dev)
+
+    def _read_stdin(self):
+        # the only blocking call lives here so the main loop keeps flushing output
+        for line in sys.stdin:
+            self.commands.put(line)
+        self.commands.put(None)
+
+    def run(self, replay_path: Optional[str] = None):
+        self.running = True
+        self.manager.start_all()
+        self.writer.write(f"Devices: {', '.join(self.manager.list_devices())}. @device to switch, /quit to exit.")
+        if replay_path and not self.replay(replay_path):
+            # the file itself said /quit
+            self.running = False
+        else:
+            threading.Thread(target=self._read_stdin, name="console:input", daemon=True).start()
+        next_flush = time.monotonic()
+        while self.running:
+            try:
+                line = self.commands.get(timeout=max(0.0, next_flush - time.monotonic()))
+                if line is None or not self.route(line):
+                    self.running = False
+            except queue.Empty:
+                pass
+            if time.monotonic() >= next_flush:
+                self.pump_messages()
+                self.writer.flush()
+                next_flush = time.monotonic() + FLUSH_INTERVAL
+        self.pump_messages()
+        self.writer.flush()
+
+
+def run_console(manager: SerialManager, replay_path: Optional[str] = None):
+    console = Console(manager)
+    try:
+        console.run(replay_path)
+    except KeyboardInterrupt:
+        pass
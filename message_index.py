@@ -0,0 +1,172 @@
+import re
+import threading
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+CUTOFF_SLACK = 1.0
+MAX_PREFIX_LEN = 16
+DEFAULT_LIMIT = 200
+# approximate bytes per posting entry (and per docs/per_device bookkeeping entry), measured with tracemalloc
+ENTRY_BYTES = 40
+
+_TERM_SPLIT = re.compile(r"[^0-9A-Za-z_]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split a message into lowercase search terms.
+    "SIMON:FAIL 3" -> ["simon", "fail", "3"]
+    """
+    return [t for t in _TERM_SPLIT.split(text.lower()) if t]
+
+
+def _keys(device: str, src: str, text: str) -> List[Tuple[str, str]]:
+    keys: List[Tuple[str, str]] = [("device", device), ("src", src.upper())]
+    seen = set()
+    for term in tokenize(text):
+        for p in _prefixes(term):
+            if p not in seen:
+                seen.add(p)
+                keys.append(("term", p))
+    return keys
+
+
+def _prefixes(term: str) -> Iterable[str]:
+    for n in range(1, min(len(term), MAX_PREFIX_LEN) + 1):
+        yield term[:n]
+    if len(term) > MAX_PREFIX_LEN:
+        yield term
+
+
+def _entry_bytes(key_count: int) -> int:
+    # one entry per posting, its docs slot and its per_device slot
+    return (key_count + 2) * ENTRY_BYTES
+
+
+class MessageIndex:
+    """
+    Inverted index over the message buffers of all devices, maintained at ingest.
+
+    Postings are keyed by term prefix, device and source; time filters are a
+    timestamp cutoff while walking postings newest-first. Each device keeps at
+    most as many documents as its worker still retains: the worker reports the
+    oldest id it kept and older documents are dropped here.
+
+    Documents are the workers' own message dicts, not copies; the device of a
+    document is only recorded in its device posting and per_device queue.
+    The index does not charge a byte budget itself: each worker's Retention
+    charges doc_size() with the message, so the bytes come back exactly when
+    the message is evicted. bytes tracks the same estimate for stats.
+    """
+
+    def __init__(self):
+        self.bytes = 0
+        self.lock = threading.Lock()
+        self.docs: Dict[int, Dict] = {}
+        self.postings: Dict[Tuple[str, str], Dict[int, None]] = {}
+        self.per_device: Dict[str, Deque[int]] = {}
+        self.doc_counter = 0
+
+    def add(self, device: str, message: Dict, oldest_id: int = 0):
+        """Index one message; drop this device's documents older than oldest_id."""
+        keys = _keys(device, message.get("src", ""), message.get("text", ""))
+
+        with self.lock:
+            self.doc_counter += 1
+            doc_id = self.doc_counter
+            self.docs[doc_id] = message
+            self.bytes += _entry_bytes(len(keys))
+            for key in keys:
+                posting = self.postings.get(key)
+                if posting is None:
+                    posting = self.postings[key] = {}
+                posting[doc_id] = None
+            queue = self.per_device.setdefault(device, deque())
+            queue.append(doc_id)
+            while queue and self.docs[queue[0]].get("id", 0) < oldest_id:
+                self._remove(device, queue.popleft())
+
+    def _remove(self, device: str, doc_id: int):
+        doc = self.docs.pop(doc_id, None)
+        if doc is None:
+            return
+        # keys are rebuilt rather than kept per doc; only the posting entries stay resident
+        keys = _keys(device, doc.get("src", ""), doc.get("text", ""))
+        self.bytes -= _entry_bytes(len(keys))
+        for key in keys:
+            posting = self.postings.get(key)
+            if posting is None:
+                continue
+            posting.pop(doc_id, None)
+            if not posting:
+                del self.postings[key]
+
+    def doc_size(self, message: Dict) -> int:
+        """Approximate bytes the index keeps for one message, whichever device it is from."""
+        return _entry_bytes(len(_keys("", message.get("src", ""), message.get("text", ""))))
+
+    def search(
+        self,
+        query: str = "",
+        device: Optional[str] = None,
+        src: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: int = DEFAULT_LIMIT,
+    ) -> List[Dict]:
+        """
+        Return matching messages, newest first.
+        Every query term must match a term (or term prefix) of the message.
+        """
+        if limit <= 0:
+            return []
+        terms = tokenize(query)
+        long_terms = [t for t in terms if len(t) > MAX_PREFIX_LEN]
+        with self.lock:
+            sets: List[Dict[int, None]] = []
+            for term in terms:
+                sets.append(self.postings.get(("term", term[:MAX_PREFIX_LEN]), {}))
+            if device:
+                sets.append(self.postings.get(("device", device), {}))
+            if src:
+                sets.append(self.postings.get(("src", src.upper()), {}))
+            sets.sort(key=len)
+            walk = sets[0] if sets else self.docs
+            rest = sets[1:]
+
+            results: List[Dict] = []
+            # doc ids only grow and postings keep insertion order, so walking the
+            # smallest posting backwards yields newest first and can stop early
+            for doc_id in reversed(walk):
+                doc = self.docs[doc_id]
+                ts = doc.get("ts", 0.0)
+                if until is not None and ts > until:
+                    continue
+                if since is not None and ts < since:
+                    # ts is taken before the index lock, so allow a little reordering across devices
+                    if ts < since - CUTOFF_SLACK:
+                        break
+                    continue
+                if rest and not all(doc_id in p for p in rest):
+                    continue
+                if long_terms:
+                    doc_terms = tokenize(doc.get("text", ""))
+                    if not all(any(x.startswith(t) for x in doc_terms) for t in long_terms):
+                        continue
+                result = dict(doc)
+                result["device"] = device or self._device_of(doc_id)
+                results.append(result)
+                if len(results) >= limit:
+                    break
+            return results
+
+    def _device_of(self, doc_id: int) -> str:
+        # only a handful of devices, so probing their postings beats storing the name per doc
+        for device in self.per_device:
+            if doc_id in self.postings.get(("device", device), ()):
+                return device
+        return ""
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {"documents": len(self.docs), "keys": len(self.postings), "bytes": self.bytes}
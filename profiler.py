@@ -0,0 +1,97 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional, Tuple
+
+PROFILER_ENABLED = os.environ.get("ENABLE_PROFILER", "0").lower() in ("1", "true", "yes")
+DEFAULT_HZ = 100
+MAX_HZ = 1000
+MAX_SECONDS = 60
+
+_profile_lock = threading.Lock()
+
+
+def thread_label(thread: Optional[threading.Thread]) -> str:
+    """
+    Threads are named "<device>:<role>" by the workers (e.g. "SimonSays:reader");
+    anything else is labeled by its Python thread name.
+    """
+    if thread is None:
+        return "unknown"
+    if thread is threading.main_thread():
+        return "main"
+    if "process_request_thread" in thread.name:
+        # werkzeug's per-request threads
+        return "http:request"
+    return thread.name
+
+
+class StackSampler:
+    """
+    Samples every thread's Python stack at a fixed rate using sys._current_frames()
+    and counts identical stacks. Runs in the calling thread, which is left out.
+    """
+
+    def __init__(self, hz: float = DEFAULT_HZ, with_lines: bool = False):
+        self.interval = 1.0 / max(1.0, min(hz, MAX_HZ))
+        self.with_lines = with_lines
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._names: Dict[object, str] = {}
+
+    def _frame_name(self, frame) -> str:
+        code = frame.f_code
+        if self.with_lines:
+            return f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+        # code objects are stable, so build each label once
+        name = self._names.get(code)
+        if name is None:
+            name = self._names[code] = f"{code.co_name} ({os.path.basename(code.co_filename)})"
+        return name
+
+    def run(self, seconds: float):
+        me = threading.get_ident()
+        deadline = time.perf_counter() + seconds
+        next_at = time.perf_counter()
+        while next_at < deadline:
+            threads = {t.ident: t for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(self._frame_name(frame))
+                    frame = frame.f_back
+                stack.append(thread_label(threads.get(ident)))
+                self.stacks[tuple(reversed(stack))] += 1
+            self.samples += 1
+            next_at += self.interval
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+    def collapsed(self) -> str:
+        """One "thread;outer;...;inner count" line per stack, as consumed by flamegraph.pl."""
+        lines = [f"{';'.join(stack)} {count}" for stack, count in self.stacks.most_common()]
+        return "\n".join(lines) + "\n"
+
+    def by_thread(self) -> Dict[str, int]:
+        totals: Counter = Counter()
+        for stack, count in self.stacks.items():
+            totals[stack[0]] += count
+        return dict(totals.most_common())
+
+
+def profile(seconds: float, hz: float = DEFAULT_HZ, with_lines: bool = False) -> Optional[Tuple[StackSampler, float]]:
+    """Sample for the given time; returns None if another profile is already running."""
+    if not _profile_lock.acquire(blocking=False):
+        return None
+    try:
+        sampler = StackSampler(hz, with_lines)
+        started = time.perf_counter()
+        sampler.run(max(0.1, min(seconds, MAX_SECONDS)))
+        return sampler, time.perf_counter() - started
+    finally:
+        _profile_lock.release()
@@ -1,5 +1,8 @@
+from functools import partial
 from typing import Dict, List, Optional, Tuple
 
+from message_index import MessageIndex
+from workers.audio_process import close_audio_engine, get_audio_engine
 from workers.dummy_worker import DummyWorker
 from workers.serial_worker_escape_room import EscapeRoomWorker
 from workers.serial_worker_simon_says import SimonSaysWorker
@@ -11,9 +14,10 @@ class SerialManager:
         """
         device_specs: list of (device_id, worker_type, port)
         worker_type: "serial" or "dummy"
-        port: required for serial, ignored for dummy
+        port: required for serial; for dummy an optional load spec (see workers.dummy_worker.parse_load_spec)
         """
         self.workers: Dict[str, object] = {}
+        self.index = MessageIndex()
         for dev_id, worker_type, port in device_specs:
             wt = worker_type.lower()
             if wt in ("serial", "simon", "simonsays"):
@@ -33,13 +37,16 @@ class SerialManager:
                 if name and (name.upper().startswith("COM") or name.startswith("/dev/")):
                     name = worker.default_id
             elif wt == "dummy":
-                worker = DummyWorker(name=dev_id or "dummy")
+                worker = DummyWorker(name=dev_id or "dummy", load_spec=port)
                 name = dev_id or worker.name
             else:
                 raise ValueError(f"Unknown worker type: {worker_type}")
 
             unique_name = self._make_unique_name(name)
             self.workers[unique_name] = worker
+            worker.device_id = unique_name
+            worker.message_listener = partial(self.index.add, unique_name)
+            worker.retention.index_size = self.index.doc_size
 
     def _make_unique_name(self, base: str) -> str:
         if base not in self.workers:
@@ -50,6 +57,8 @@ class SerialManager:
         return f"{base}_{idx}"
 
     def start_all(self):
+        # start the audio child process (if enabled) before the first sound hook fires
+        get_audio_engine()
         for w in self.workers.values():
             if hasattr(w, "start"):
                 w.start()
@@ -65,13 +74,28 @@ class SerialManager:
     def list_devices(self) -> List[str]:
         return list(self.workers.keys())
 
-    def get_statuses(self) -> Dict[str, Dict[str, bool]]:
+    def get_statuses(self) -> Dict[str, Dict[str, object]]:
         return {dev: worker.get_status() for dev, worker in self.workers.items()}
 
-    def get_messages_since(self, last_ids: Dict[str, int]) -> Tuple[List[Dict,], Dict[str, int]]:
+    def get_metrics(self) -> Dict[str, Dict]:
+        metrics: Dict[str, Dict] = {}
+        for dev, worker in self.workers.items():
+            if hasattr(worker, "get_metrics"):
+                metrics[dev] = worker.get_metrics()
+        return metrics
+
+    def get_audio_stats(self) -> Optional[Dict]:
+        engine = get_audio_engine()
+        return engine.get_stats() if engine else None
+
+    def get_messages_since(
+        self, last_ids: Dict[str, int], device: Optional[str] = None
+    ) -> Tuple[List[Dict,], Dict[str, int]]:
         combined: List[Dict] = []
         new_last: Dict[str, int] = dict(last_ids)
         for dev, worker in self.workers.items():
+            if device and dev != device:
+                continue
             lid = last_ids.get(dev, 0)
             msgs = worker.get_messages_since(lid)
             if msgs:
@@ -83,7 +107,19 @@ class SerialManager:
         combined.sort(key=lambda m: m.get("ts", 0))
         return combined, new_last
 
+    def search_messages(
+        self,
+        query: str = "",
+        device: Optional[str] = None,
+        src: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: int = 200,
+    ) -> List[Dict]:
+        return self.index.search(query, device=device, src=src, since=since, until=until, limit=limit)
+
     def close_all(self):
         for w in self.workers.values():
             if hasattr(w, "close"):
                 w.close()
+        close_audio_engine()
@@ -1,8 +1,18 @@
 let lastId = 0;
 let es;
 
+const LOG_SCROLLBACK = 5000;
+const logModel = new LogModel(LOG_SCROLLBACK);
+let logFollow = true;
+let logRenderPending = false;
+let logRowHeight = 18;
+
+// ?device=NAME on the page URL filters the stream on the server as well
+const serverDevice = new URLSearchParams(window.location.search).get("device") || "";
+
 function connectStream() {
-  es = new EventSource("/api/stream");
+  const query = serverDevice ? `?device=${encodeURIComponent(serverDevice)}` : "";
+  es = new EventSource(`/api/stream${query}`);
   es.onmessage = (evt) => {
     if (!evt.data) return;
     try {
@@ -30,18 +40,62 @@ function handlePayload(payload) {
 
 function updateMessages(msgs) {
   if (!Array.isArray(msgs)) return;
-  const log = document.getElementById("log");
-  const lines = log.textContent ? log.textContent.split("\n") : [];
   msgs.forEach((m) => {
     if (typeof m.id === "number") {
       lastId = Math.max(lastId, m.id);
     }
-    const deviceTag = m.device ? `[${m.device}] ` : "";
-    lines.push(`${deviceTag}[${m.src}] ${m.text}`);
+    logModel.push(m);
+  });
+  scheduleLogRender();
+}
+
+// Coalesce all updates that land within one frame into a single DOM write.
+function scheduleLogRender() {
+  if (logRenderPending) return;
+  logRenderPending = true;
+  window.requestAnimationFrame(renderLog);
+}
+
+function renderLog() {
+  logRenderPending = false;
+  const log = document.getElementById("log");
+  const total = logModel.count();
+  log.querySelector(".log-spacer").style.height = `${total * logRowHeight}px`;
+  if (logFollow) log.scrollTop = log.scrollHeight;
+  const win = computeWindow(log.scrollTop, log.clientHeight, logRowHeight, total);
+  const rows = log.querySelector(".log-rows");
+  rows.style.transform = `translateY(${win.offset}px)`;
+  rows.textContent = logModel.lines(win.start, win.end).join("\n");
+}
+
+function initLog() {
+  const log = document.getElementById("log");
+  const rows = log.querySelector(".log-rows");
+  logRowHeight = parseFloat(getComputedStyle(rows).lineHeight) || logRowHeight;
+  log.addEventListener("scroll", () => {
+    logFollow = log.scrollTop + log.clientHeight >= log.scrollHeight - logRowHeight;
+    scheduleLogRender();
   });
-  const maxLines = 400;
-  const trimmed = lines.slice(-maxLines);
-  log.textContent = trimmed.join("\n");
+  const select = document.getElementById("log-device");
+  select.addEventListener("change", () => {
+    logModel.setDeviceFilter(select.value);
+    logFollow = true;
+    scheduleLogRender();
+  });
+  if (serverDevice) {
+    addDeviceOption(serverDevice);
+    select.value = serverDevice;
+    logModel.setDeviceFilter(serverDevice);
+  }
+}
+
+function addDeviceOption(device) {
+  const select = document.getElementById("log-device");
+  if (!select || Array.from(select.options).some((o) => o.value === device)) return;
+  const opt = document.createElement("option");
+  opt.value = device;
+  opt.textContent = device;
+  select.appendChild(opt);
 }
 
 function updateStatuses(statuses) {
@@ -50,6 +104,7 @@ function updateStatuses(statuses) {
   let agg = { ready: false, win: false, fail: false };
   let simonArmed = false;
   Object.entries(statuses).forEach(([device, s]) => {
+    addDeviceOption(device);
     const name = (device || "").toLowerCase();
     if (name.includes("simon")) {
       if (s.armed) simonArmed = true;
@@ -71,7 +126,8 @@ function setDot(id, cls) {
 
 async function sendCommand(cmd) {
   if (!cmd) return;
-  await fetch("/api/send", {
+  const query = serverDevice ? `?device=${encodeURIComponent(serverDevice)}` : "";
+  await fetch(`/api/send${query}`, {
     method: "POST",
     headers: { "Content-Type": "application/json" },
     body: JSON.stringify({ cmd }),
@@ -89,5 +145,6 @@ async function sendForm(ev) {
 }
 
 window.onload = () => {
+  initLog();
   connectStream();
 };
@@ -0,0 +1,103 @@
+// Log rendering model shared by the dashboard and bench/logview_bench.js.
+// Nothing in here touches the DOM so it can be exercised from node.
+
+function formatLine(m) {
+  const deviceTag = m.device ? `[${m.device}] ` : "";
+  return `${deviceTag}[${m.src}] ${m.text}`;
+}
+
+// Fixed capacity ring of log entries addressed by a monotonically increasing seq.
+class LogBuffer {
+  constructor(capacity) {
+    this.capacity = capacity;
+    this.items = new Array(capacity);
+    this.firstSeq = 0;
+    this.nextSeq = 0;
+  }
+
+  get length() {
+    return this.nextSeq - this.firstSeq;
+  }
+
+  push(entry) {
+    const seq = this.nextSeq++;
+    this.items[seq % this.capacity] = entry;
+    if (this.length > this.capacity) this.firstSeq++;
+    return seq;
+  }
+
+  get(seq) {
+    if (seq < this.firstSeq || seq >= this.nextSeq) return undefined;
+    return this.items[seq % this.capacity];
+  }
+}
+
+// Buffer plus an optional device filter. Filtered rows are tracked as a list of
+// seqs that is appended to on push and lazily trimmed as the ring evicts.
+class LogModel {
+  constructor(capacity) {
+    this.buffer = new LogBuffer(capacity);
+    this.device = "";
+    this.matches = null;
+    this.matchStart = 0;
+  }
+
+  push(m) {
+    const entry = { device: m.device || "", line: formatLine(m) };
+    const seq = this.buffer.push(entry);
+    if (this.matches && entry.device === this.device) this.matches.push(seq);
+  }
+
+  setDeviceFilter(device) {
+    this.device = device || "";
+    this.matches = null;
+    this.matchStart = 0;
+    if (!this.device) return;
+    this.matches = [];
+    for (let seq = this.buffer.firstSeq; seq < this.buffer.nextSeq; seq++) {
+      if (this.buffer.get(seq).device === this.device) this.matches.push(seq);
+    }
+  }
+
+  _trimMatches() {
+    const first = this.buffer.firstSeq;
+    while (this.matchStart < this.matches.length && this.matches[this.matchStart] < first) {
+      this.matchStart++;
+    }
+    // compact once the dead prefix dominates so the array stays bounded
+    if (this.matchStart > 1024 && this.matchStart * 2 > this.matches.length) {
+      this.matches = this.matches.slice(this.matchStart);
+      this.matchStart = 0;
+    }
+  }
+
+  count() {
+    if (!this.matches) return this.buffer.length;
+    this._trimMatches();
+    return this.matches.length - this.matchStart;
+  }
+
+  lineAt(row) {
+    if (!this.matches) return this.buffer.get(this.buffer.firstSeq + row).line;
+    return this.buffer.get(this.matches[this.matchStart + row]).line;
+  }
+
+  lines(start, end) {
+    const out = [];
+    for (let row = start; row < end; row++) out.push(this.lineAt(row));
+    return out;
+  }
+}
+
+// Rows to materialize for a scroll position, with a little overscan on each side.
+function computeWindow(scrollTop, viewportHeight, rowHeight, total, overscan = 10) {
+  const first = Math.floor(scrollTop / rowHeight);
+  const visible = Math.ceil(viewportHeight / rowHeight);
+  const start = Math.max(0, first - overscan);
+  const end = Math.min(total, first + visible + overscan);
+  return { start, end, offset: start * rowHeight };
+}
+
+if (typeof module !== "undefined") {
+  module.exports = { LogBuffer, LogModel, computeWindow, formatLine };
+}
@@ -1,9 +1,12 @@
 import json
+import threading
 import time
 
 from flask import Flask, Response, jsonify, render_template_string, request, stream_with_context, url_for
 
+import profiler
 from serial_manager import SerialManager
+from workers.retention import global_stats as retention_stats
 
 
 def create_app(manager: SerialManager) -> Flask:
@@ -70,11 +73,14 @@ def create_app(manager: SerialManager) -> Flask:
     <div class="panel" style="grid-column: 1 / -1;">
       <div class="flex-between">
         <h3>Serial Log</h3>
-        <small>Live tail</small>
+        <select id="log-device" class="inline-select">
+          <option value="">All devices</option>
+        </select>
       </div>
-      <pre id="log"></pre>
+      <div id="log" class="log"><div class="log-spacer"></div><pre class="log-rows"></pre></div>
     </div>
   </div>
+  <script src="{{ url_for('static', filename='logview.js') }}"></script>
   <script src="{{ url_for('static', filename='app.js') }}"></script>
 </body>
 </html>
@@ -83,21 +89,52 @@ def create_app(manager: SerialManager) -> Flask:
 
     @app.route("/api/messages")
     def api_messages():
-        msgs, _ = manager.get_messages_since({})
+        msgs, _ = manager.get_messages_since({}, device=request.args.get("device") or None)
         return jsonify({"messages": msgs})
 
+    @app.route("/api/search")
+    def api_search():
+        # e.g. /api/search?q=fail&device=SimonSays&src=ESP32&last=600
+        since = request.args.get("since", type=float)
+        until = request.args.get("until", type=float)
+        last = request.args.get("last", type=float)
+        if last is not None:
+            since = time.time() - last
+        started = time.perf_counter()
+        msgs = manager.search_messages(
+            request.args.get("q", ""),
+            device=request.args.get("device") or None,
+            src=request.args.get("src") or None,
+            since=since,
+            until=until,
+            limit=request.args.get("limit", default=200, type=int),
+        )
+        took_ms = (time.perf_counter() - started) * 1000
+        return jsonify({"messages": msgs, "took_ms": round(took_ms, 3)})
+
     @app.route("/api/status")
     def api_status():
         return jsonify(manager.get_statuses())
 
+    @app.route("/api/metrics")
+    def api_metrics():
+        metrics = {"devices": manager.get_metrics(), "index": manager.index.stats(), "memory": retention_stats()}
+        audio = manager.get_audio_stats()
+        if audio:
+            metrics["audio"] = audio
+        return jsonify(metrics)
+
     @app.route("/api/stream")
     def api_stream():
+        device = request.args.get("device") or None
+
         @stream_with_context
         def event_stream():
+            threading.current_thread().name = f"http:sse:{device}" if device else "http:sse"
             last_ids = {}
             heartbeat_at = time.time()
             while True:
-                new_messages, last_ids = manager.get_messages_since(last_ids)
+                new_messages, last_ids = manager.get_messages_since(last_ids, device=device)
                 if new_messages:
                     payload = {"type": "messages", "messages": new_messages, "status": manager.get_statuses()}
                     yield f"data: {json.dumps(payload)}\n\n"
@@ -111,6 +148,29 @@ def create_app(manager: SerialManager) -> Flask:
 
         return Response(event_stream(), mimetype="text/event-stream")
 
+    @app.route("/debug/profile")
+    def debug_profile():
+        # opt-in: ENABLE_PROFILER=1; e.g. /debug/profile?seconds=5&hz=200&format=json
+        if not profiler.PROFILER_ENABLED:
+            return jsonify({"error": "Profiler disabled, set ENABLE_PROFILER=1"}), 404
+        seconds = request.args.get("seconds", default=5.0, type=float)
+        hz = request.args.get("hz", default=profiler.DEFAULT_HZ, type=float)
+        with_lines = request.args.get("lines", "0") == "1"
+        result = profiler.profile(seconds, hz=hz, with_lines=with_lines)
+        if result is None:
+            return jsonify({"error": "A profile is already running"}), 409
+        sampler, duration = result
+        if request.args.get("format") == "json":
+            return jsonify(
+                {
+                    "duration": round(duration, 3),
+                    "samples": sampler.samples,
+                    "threads": sampler.by_thread(),
+                    "stacks": [{"stack": list(stack), "count": n} for stack, n in sampler.stacks.most_common()],
+                }
+            )
+        return Response(sampler.collapsed(), mimetype="text/plain")
+
     @app.route("/api/send", methods=["POST"])
     def api_send():
         device = request.args.get("device")
@@ -16,10 +16,11 @@ _cache: Dict[Path, pygame.mixer.Sound] = {}
 _preroll_sound: Optional[pygame.mixer.Sound] = None
 
 
-def init_audio():
+def init_audio() -> bool:
+    """Initialise the mixer once; returns False if audio is unavailable."""
     global _initialized, _failed, _preroll_sound
     if _initialized or _failed:
-        return
+        return _initialized
     try:
         freq = int(os.environ.get("AUDIO_RATE", "22050"))
         buf = int(os.environ.get("AUDIO_BUFFER", "128"))
@@ -31,15 +32,17 @@ def init_audio():
     except Exception as e:
         _failed = True
         print(f"(Audio init failed: {e})")
+    return _initialized
 
 
-def play_sound_file(path: Path):
+def play_sound_file(path: Path) -> bool:
+    """Start playback on a free channel; returns True once the sound is playing."""
     init_audio()
     if _failed:
-        return
+        return False
     if not path.exists():
         print(f"(Sound file not found at {path})")
-        return
+        return False
     try:
         snd = _cache.get(path)
         if snd is None:
@@ -51,8 +54,10 @@ def play_sound_file(path: Path):
             channel.queue(snd)
         else:
             channel.play(snd)
+        return True
     except Exception as e:
         print(f"(Audio play failed for {path}: {e})")
+        return False
 
 
 def _make_silence_sound(freq: int) -> Optional[pygame.mixer.Sound]:
@@ -0,0 +1,224 @@
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+# AUDIO_PROCESS=1 moves pygame init, decoding and mixing into a child process
+AUDIO_PROCESS = os.environ.get("AUDIO_PROCESS", "0").lower() in ("1", "true", "yes")
+MAX_RESTART_DELAY = 5.0
+PENDING_TIMEOUT = 10.0
+EXIT_AUDIO_FAILED = 3
+
+_engine: Optional["AudioProcess"] = None
+_engine_lock = threading.Lock()
+
+
+def _child_main(conn):
+    """
+    Child process loop: ("play", seq, path) in, ("ack", seq, started_at) or ("error", seq) out.
+    Exits non-zero when the mixer is unusable so the parent restarts it with backoff.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # imported here so pygame is only initialised in the child
+    from workers.audio import init_audio, play_sound_file
+
+    if not init_audio():
+        sys.exit(EXIT_AUDIO_FAILED)
+    while True:
+        try:
+            msg = conn.recv()
+        except (EOFError, OSError):
+            return
+        if msg[0] == "stop":
+            return
+        if msg[0] == "play":
+            _, seq, path = msg
+            path = Path(path)
+            if play_sound_file(path):
+                conn.send(("ack", seq, time.time()))
+                continue
+            conn.send(("error", seq))
+            # a missing file is the caller's problem; anything else means the mixer is in a bad state
+            if path.exists():
+                sys.exit(EXIT_AUDIO_FAILED)
+
+
+class AudioProcess:
+    """
+    Parent side of the out-of-process audio engine.
+
+    Play commands go over a pipe and return immediately; the child acknowledges
+    each one once playback has started, which gives the command-to-sound latency.
+    A monitor thread collects acks and restarts the child (with backoff) if it dies.
+    """
+
+    def __init__(self):
+        self.ctx = multiprocessing.get_context("spawn")
+        self.lock = threading.Lock()
+        self.conn = None
+        self.proc = None
+        self.seq = 0
+        self.pending: Dict[int, float] = {}
+        self.plays = 0
+        self.acks = 0
+        self.errors = 0
+        self.dropped = 0
+        self.restarts = 0
+        self.ack_latency_last: Optional[float] = None
+        self.ack_latency_avg: Optional[float] = None
+        self.ack_latency_max = 0.0
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self._spawn()
+        self.thread = threading.Thread(target=self._monitor_loop, name="audio:monitor", daemon=True)
+        self.thread.start()
+
+    def _spawn(self):
+        parent_conn, child_conn = self.ctx.Pipe()
+        proc = self.ctx.Process(target=_child_main, args=(child_conn,), name="audio-engine", daemon=True)
+        proc.start()
+        child_conn.close()
+        with self.lock:
+            self.conn = parent_conn
+            self.proc = proc
+            self.pending.clear()
+
+    def play(self, path: Path):
+        with self.lock:
+            if self.conn is None:
+                self.dropped += 1
+                return
+            self.seq += 1
+            sent_at = time.time()
+            try:
+                self.conn.send(("play", self.seq, str(path)))
+            except (OSError, ValueError):
+                # child is gone; the monitor thread restarts it
+                self.dropped += 1
+                return
+            self.pending[self.seq] = sent_at
+            self.plays += 1
+
+    def _monitor_loop(self):
+        failures = 0
+        while self.running:
+            conn, proc = self.conn, self.proc
+            if conn is None:
+                return
+            try:
+                if conn.poll(0.5):
+                    msg = conn.recv()
+                    self._handle(msg)
+                    # only a sound that actually started proves the child healthy
+                    if msg[0] == "ack":
+                        failures = 0
+                    continue
+                if proc.is_alive():
+                    self._expire_pending()
+                    continue
+            except (EOFError, OSError):
+                pass
+            if not self.running:
+                return
+            # child exited or the pipe broke: restart with backoff
+            with self.lock:
+                self.conn = None
+            try:
+                conn.close()
+            except OSError:
+                pass
+            proc.join(timeout=0.5)
+            failures += 1
+            delay = min(MAX_RESTART_DELAY, 0.25 * 2**failures)
+            print(f"(Audio engine exited with code {proc.exitcode}, restarting in {delay:.1f}s)")
+            time.sleep(delay)
+            if not self.running:
+                return
+            self.restarts += 1
+            self._spawn()
+
+    def _handle(self, msg):
+        with self.lock:
+            sent_at = self.pending.pop(msg[1], None)
+            if msg[0] == "error":
+                self.errors += 1
+                return
+            self.acks += 1
+            if sent_at is None:
+                return
+            latency = msg[2] - sent_at
+            self.ack_latency_last = latency
+            self.ack_latency_max = max(self.ack_latency_max, latency)
+            if self.ack_latency_avg is None:
+                self.ack_latency_avg = latency
+            else:
+                self.ack_latency_avg = self.ack_latency_avg * 0.8 + latency * 0.2
+
+    def _expire_pending(self):
+        now = time.time()
+        with self.lock:
+            for seq, sent_at in list(self.pending.items()):
+                if now - sent_at > PENDING_TIMEOUT:
+                    del self.pending[seq]
+                    self.errors += 1
+
+    def get_stats(self) -> Dict:
+        with self.lock:
+            stats: Dict = {
+                "alive": bool(self.proc and self.proc.is_alive()),
+                "plays": self.plays,
+                "acks": self.acks,
+                "errors": self.errors,
+                "dropped": self.dropped,
+                "pending": len(self.pending),
+                "restarts": self.restarts,
+            }
+            if self.ack_latency_last is not None:
+                stats["ack_latency_ms"] = round(self.ack_latency_last * 1000, 2)
+                stats["ack_latency_avg_ms"] = round(self.ack_latency_avg * 1000, 2)
+                stats["ack_latency_max_ms"] = round(self.ack_latency_max * 1000, 2)
+            return stats
+
+    def close(self):
+        self.running = False
+        with self.lock:
+            conn, proc = self.conn, self.proc
+            self.conn = None
+        if conn is not None:
+            try:
+                conn.send(("stop",))
+            except (OSError, ValueError):
+                pass
+        if proc is not None:
+            proc.join(timeout=1.0)
+            if proc.is_alive():
+                proc.terminate()
+
+
+def get_audio_engine() -> Optional[AudioProcess]:
+    """The shared out-of-process engine, started on first use; None unless AUDIO_PROCESS is set."""
+    global _engine
+    if not AUDIO_PROCESS:
+        return None
+    with _engine_lock:
+        if _engine is None:
+            _engine = AudioProcess()
+            _engine.start()
+        return _engine
+
+
+def close_audio_engine():
+    global _engine
+    with _engine_lock:
+        if _engine is not None:
+            _engine.close()
+            _engine = None
@@ -1,29 +1,97 @@
+import math
+import random
 import threading
 import time
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
+
+from workers.retention import Retention
+
+MAX_MESSAGES = 2000  # count cap; the byte budgets in workers.retention normally bind first
+DEFAULT_MIX = ["DUMMY:READY", "DUMMY:ARMED", "DUMMY:FAIL", "DUMMY:WIN"]
+
+
+def parse_load_spec(raw: str) -> Dict:
+    """
+    Parse a dummy load spec (the third part of a dummy device spec) of the form:
+    rate=2000;burst=50;mix=READY*5+FAIL+WIN;size=64;jitter=0.2
+      - rate: target messages per second
+      - burst: messages emitted back-to-back per tick (ticks are spaced burst/rate apart)
+      - mix: '+'-separated tokens with optional '*weight'; bare names get a DUMMY: prefix
+      - size: pad each message to this many characters (status still follows the token)
+      - jitter: random +/- fraction applied to every tick interval
+    """
+    spec = {"rate": 1.0, "burst": 1, "mix": [(t, 1.0) for t in DEFAULT_MIX], "size": 0, "jitter": 0.0}
+    for pair in raw.split(";"):
+        pair = pair.strip()
+        if not pair:
+            continue
+        if "=" not in pair:
+            raise ValueError(f"Dummy load option must be key=value, got {pair}")
+        key, value = pair.split("=", 1)
+        key = key.strip().lower()
+        value = value.strip()
+        if key == "rate":
+            spec["rate"] = max(0.001, float(value))
+        elif key == "burst":
+            spec["burst"] = max(1, int(value))
+        elif key == "size":
+            spec["size"] = max(0, int(value))
+        elif key == "jitter":
+            spec["jitter"] = min(1.0, max(0.0, float(value)))
+        elif key == "mix":
+            mix: List[Tuple[str, float]] = []
+            for item in value.split("+"):
+                item = item.strip()
+                if not item:
+                    continue
+                token, _, weight = item.partition("*")
+                token = token.strip().upper()
+                if ":" not in token:
+                    token = f"DUMMY:{token}"
+                w = float(weight) if weight else 1.0
+                # every weight positive and finite, so the total is too (random.choices needs that)
+                if not 0 < w < math.inf:
+                    raise ValueError(f"Mix weight for {token} must be a positive number, got {weight}")
+                mix.append((token, w))
+            if mix:
+                spec["mix"] = mix
+        else:
+            raise ValueError(f"Unknown dummy load option: {key}")
+    return spec
 
 
 class DummyWorker:
     """
     Simple in-memory worker used as a placeholder device.
     Generates periodic status messages and echoes commands.
+    With a load spec it becomes a load generator (see parse_load_spec).
     """
 
-    def __init__(self, name: str = "dummy"):
+    def __init__(self, name: str = "dummy", load_spec: Optional[str] = None):
         self.name = name
+        # set by SerialManager to the unique device name; used to label threads
+        self.device_id = name
+        self.load = parse_load_spec(load_spec) if load_spec else None
         self.messages: List[Dict] = []
         self.messages_lock = threading.Lock()
+        self.retention = Retention(MAX_MESSAGES)
         self.status = {"ready": False, "armed": False, "win": False, "fail": False}
         self.status_lock = threading.Lock()
         self.msg_counter = 0
         self.running = False
         self.thread: Optional[threading.Thread] = None
+        # called with (message, oldest_retained_id) after every append, e.g. by the search index
+        self.message_listener: Optional[Callable[[Dict, int], None]] = None
+        self.generated = 0
+        self.achieved_rate = 0.0
+        self.load_started_at: Optional[float] = None
 
     def start(self):
         if self.running:
             return
         self.running = True
-        self.thread = threading.Thread(target=self._loop, daemon=True)
+        target = self._load_loop if self.load else self._loop
+        self.thread = threading.Thread(target=target, name=f"{self.device_id}:dummy", daemon=True)
         self.thread.start()
 
     def _loop(self):
@@ -35,25 +103,58 @@ class DummyWorker:
             time.sleep(2)
             idx += 1
 
+    def _load_loop(self):
+        load = self.load
+        burst = load["burst"]
+        interval = burst / load["rate"]
+        jitter = load["jitter"]
+        size = load["size"]
+        tokens = [t for t, _ in load["mix"]]
+        weights = [w for _, w in load["mix"]]
+        # pre-render padded lines so the hot loop only picks strings
+        lines = {t: t if len(t) + 1 >= size else f"{t} {'x' * (size - len(t) - 1)}" for t in tokens}
+
+        started = time.monotonic()
+        self.load_started_at = time.time()
+        next_at = started
+        window_at, window_count = started, 0
+        while self.running:
+            for token in random.choices(tokens, weights, k=burst):
+                self._append_message("ESP32", lines[token])
+            self.generated += burst
+            now = time.monotonic()
+            if now - window_at >= 1.0:
+                self.achieved_rate = (self.generated - window_count) / (now - window_at)
+                window_at, window_count = now, self.generated
+            next_at += interval * (1 + random.uniform(-jitter, jitter)) if jitter else interval
+            delay = next_at - now
+            if delay > 0:
+                time.sleep(delay)
+            elif delay < -1.0:
+                # more than a second behind: the target rate is unreachable, stop accumulating debt
+                next_at = now
+
     def send_line(self, line: str):
         self._append_message("HOST", line)
 
     def _append_message(self, src: str, text: str):
         with self.messages_lock:
             self.msg_counter += 1
-            self.messages.append({"id": self.msg_counter, "src": src, "text": text, "ts": time.time()})
-            if len(self.messages) > 200:
-                del self.messages[:-200]
+            msg = self.retention.make_message(self.msg_counter, src, text, time.time())
+            self.retention.add(self.messages, msg)
+            if self.message_listener:
+                self.message_listener(msg, self.messages[0]["id"])
+        token = text.split(" ", 1)[0]
         with self.status_lock:
-            if text == "DUMMY:READY":
+            if token == "DUMMY:READY":
                 self.status["ready"] = True
                 self.status["armed"] = False
-            elif text == "DUMMY:ARMED":
+            elif token == "DUMMY:ARMED":
                 self.status["armed"] = True
                 self.status["ready"] = False
-            elif text == "DUMMY:WIN":
+            elif token == "DUMMY:WIN":
                 self.status["win"] = True
-            elif text == "DUMMY:FAIL":
+            elif token == "DUMMY:FAIL":
                 self.status["fail"] = True
 
     def get_messages(self):
@@ -70,5 +171,19 @@ class DummyWorker:
         with self.status_lock:
             return dict(self.status)
 
+    def get_metrics(self) -> Dict:
+        with self.messages_lock:
+            memory = self.retention.stats()
+        metrics: Dict = {"messages": self.msg_counter, "memory": memory}
+        if self.load:
+            elapsed = time.time() - self.load_started_at if self.load_started_at else 0.0
+            metrics["load"] = {
+                "target_rate": self.load["rate"],
+                "achieved_rate": round(self.achieved_rate, 1),
+                "average_rate": round(self.generated / elapsed, 1) if elapsed > 0 else 0.0,
+                "generated": self.generated,
+            }
+        return metrics
+
     def close(self):
         self.running = False
@@ -0,0 +1,118 @@
+import math
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Optional, Tuple
+
+PROBE_INTERVAL = float(os.environ.get("LATENCY_PROBE_SECONDS", "0"))
+PROBE_TIMEOUT = 5.0
+SAMPLE_WINDOW = 8
+PING_PREFIX = "PING"
+PONG_PREFIX = "PONG"
+
+
+class LatencyProbe:
+    """
+    Periodic PING/PONG round-trip probe for one serial device.
+
+    The host writes "PING <seq>" and the firmware answers "PONG <seq> [device_ms]".
+    Round-trip time is measured on the host. When the reply carries the board's
+    own clock (ms), the clock offset is estimated NTP-style, assuming the board
+    stamped the reply halfway through the round trip:
+        offset = device_time - (sent + received) / 2
+    Of the last few samples, the one with the lowest RTT gives the offset,
+    since it has the least room for asymmetric delay.
+    """
+
+    def __init__(self, send: Callable[[str], None], interval: float = PROBE_INTERVAL):
+        self.send = send
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.pending: Dict[int, float] = {}
+        self.samples: Deque[Tuple[float, Optional[float]]] = deque(maxlen=SAMPLE_WINDOW)
+        self.seq = 0
+        self.sent = 0
+        self.received = 0
+        self.lost = 0
+        self.rtt_avg: Optional[float] = None
+        self.last_reply_at: Optional[float] = None
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self, name: str = "latency"):
+        if self.running or self.interval <= 0:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._loop, name=name, daemon=True)
+        self.thread.start()
+
+    def _loop(self):
+        while self.running:
+            self.ping()
+            time.sleep(self.interval)
+
+    def ping(self):
+        with self.lock:
+            self.seq += 1
+            seq = self.seq
+            now = time.time()
+            for old, sent_at in list(self.pending.items()):
+                if now - sent_at > PROBE_TIMEOUT:
+                    del self.pending[old]
+                    self.lost += 1
+            self.pending[seq] = now
+            self.sent += 1
+        try:
+            self.send(f"{PING_PREFIX} {seq}")
+        except Exception as e:
+            print(f"(Latency probe send failed: {e})")
+
+    def handle_line(self, line: str, received_at: float) -> bool:
+        """Consume a PONG reply; returns False for any other line."""
+        if not line.startswith(PONG_PREFIX):
+            return False
+        parts = line.split()
+        if len(parts) < 2 or parts[0] != PONG_PREFIX:
+            return False
+        try:
+            seq = int(parts[1])
+            device_time = float(parts[2]) / 1000 if len(parts) > 2 else None
+        except ValueError:
+            return False
+        if device_time is not None and not math.isfinite(device_time):
+            # "nan"/"inf" parse as floats but would make offset_ms unserialisable
+            return False
+        with self.lock:
+            sent_at = self.pending.pop(seq, None)
+            if sent_at is None:
+                # late reply for a ping already counted as lost
+                return True
+            rtt = received_at - sent_at
+            offset = device_time - (sent_at + received_at) / 2 if device_time is not None else None
+            self.samples.append((rtt, offset))
+            self.received += 1
+            self.last_reply_at = received_at
+            self.rtt_avg = rtt if self.rtt_avg is None else self.rtt_avg * 0.8 + rtt * 0.2
+        return True
+
+    def get_stats(self) -> Dict:
+        with self.lock:
+            stats: Dict = {"sent": self.sent, "received": self.received, "lost": self.lost}
+            if not self.samples:
+                return stats
+            rtts = [r for r, _ in self.samples]
+            stats["rtt_ms"] = round(rtts[-1] * 1000, 2)
+            stats["rtt_avg_ms"] = round(self.rtt_avg * 1000, 2)
+            stats["rtt_min_ms"] = round(min(rtts) * 1000, 2)
+            stats["rtt_max_ms"] = round(max(rtts) * 1000, 2)
+            with_offset = [s for s in self.samples if s[1] is not None]
+            if with_offset:
+                best_rtt, best_offset = min(with_offset, key=lambda s: s[0])
+                stats["offset_ms"] = round(best_offset * 1000, 2)
+                stats["offset_error_ms"] = round(best_rtt * 500, 2)
+            stats["last_reply_age_s"] = round(time.time() - self.last_reply_at, 1)
+            return stats
+
+    def stop(self):
+        self.running = False
@@ -0,0 +1,239 @@
+import os
+import sys
+import threading
+from typing import Callable, Dict, List, Optional, Set
+
+DEVICE_BYTES = int(os.environ.get("RETENTION_DEVICE_BYTES", str(256 * 1024)))
+TOTAL_BYTES = int(os.environ.get("RETENTION_TOTAL_BYTES", str(2 * 1024 * 1024)))
+INTERN_MAX_ENTRIES = int(os.environ.get("INTERN_MAX_ENTRIES", "4096"))
+INTERN_MAX_LEN = 64
+INTERN_ENTRY_BYTES = 16
+# a hash int in the candidate set
+INTERN_CANDIDATE_BYTES = 36
+
+
+class ByteBudget:
+    """
+    Global byte counter. Charged by every device's retention (including its
+    messages' search index entries) and the intern table, so the limit covers
+    all three.
+    """
+
+    def __init__(self, limit: int = TOTAL_BYTES):
+        self.limit = limit
+        self.used = 0
+        self.lock = threading.Lock()
+
+    def add(self, n: int):
+        with self.lock:
+            self.used += n
+
+
+def _table_only_refcount() -> int:
+    # sys.getrefcount of a str held only by an intern table, as seen from InternTable._sweep
+    probe = "".join(["intern", "-probe"])
+    table = {probe: probe}
+    del probe
+    for s in list(table):
+        return sys.getrefcount(s)
+    return 0
+
+
+_TABLE_ONLY_REFS = _table_only_refcount()
+
+
+class InternTable:
+    """
+    Bounded string intern table so repeated tokens ("SIMON:READY", "ESP32", ...)
+    share one str object across all retained messages. Only short strings are
+    interned, and only once they have been seen twice, so one-off lines don't
+    take up entries. When the table is full, entries no retained message uses
+    any more are dropped. Entries are charged to the budget when added and
+    released when dropped.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = INTERN_MAX_ENTRIES,
+        max_len: int = INTERN_MAX_LEN,
+        budget: Optional[ByteBudget] = None,
+    ):
+        self.max_entries = max_entries
+        self.max_len = max_len
+        self.budget = budget
+        self.table: Dict[str, str] = {}
+        # hashes of strings seen once; cleared when it reaches max_entries // 8
+        self.candidates: Set[int] = set()
+        self.max_candidates = max(1, max_entries // 8)
+        self.lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.full_misses = 0
+        self.evicted = 0
+        self.sweep_at = 0
+        self._charge(sys.getsizeof(self.table) + self._candidate_bytes())
+
+    def intern(self, s: str) -> str:
+        canonical = self.table.get(s)
+        if canonical is not None:
+            self.hits += 1
+            return canonical
+        if len(s) > self.max_len:
+            return s
+        with self.lock:
+            canonical = self.table.get(s)
+            if canonical is not None:
+                return canonical
+            if not self._seen_before(s):
+                return s
+            if len(self.table) >= self.max_entries and not self._sweep():
+                self.full_misses += 1
+                return s
+            before = sys.getsizeof(self.table)
+            self.table[s] = s
+            # the string itself, its dict entry and any growth of the table
+            self._charge(sys.getsizeof(s) + INTERN_ENTRY_BYTES + sys.getsizeof(self.table) - before)
+            return s
+
+    def _seen_before(self, s: str) -> bool:
+        before = self._candidate_bytes()
+        h = hash(s)
+        seen = h in self.candidates
+        if seen:
+            self.candidates.discard(h)
+        else:
+            if len(self.candidates) >= self.max_candidates:
+                self.candidates.clear()
+            self.candidates.add(h)
+        self._charge(self._candidate_bytes() - before)
+        return seen
+
+    def _sweep(self) -> bool:
+        """Drop entries only the table still references; returns True if any were dropped."""
+        # a sweep that finds nothing is retried only after some more misses, not on every one
+        if self.full_misses < self.sweep_at:
+            return False
+        freed, dropped = 0, 0
+        for s in list(self.table):
+            if sys.getrefcount(s) <= _TABLE_ONLY_REFS:
+                del self.table[s]
+                freed += sys.getsizeof(s) + INTERN_ENTRY_BYTES
+                dropped += 1
+        self._charge(-freed)
+        self.evicted += dropped
+        if not dropped:
+            self.sweep_at = self.full_misses + max(1, self.max_entries // 8)
+        return dropped > 0
+
+    def _candidate_bytes(self) -> int:
+        return sys.getsizeof(self.candidates) + len(self.candidates) * INTERN_CANDIDATE_BYTES
+
+    def _charge(self, size: int):
+        self.bytes += size
+        if self.budget:
+            self.budget.add(size)
+
+    def is_shared(self, s: str) -> bool:
+        return self.table.get(s) is s
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self.table),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "full_misses": self.full_misses,
+            "evicted": self.evicted,
+        }
+
+
+GLOBAL_BUDGET = ByteBudget()
+INTERN = InternTable(budget=GLOBAL_BUDGET)
+
+
+def message_size(msg: Dict, interns: InternTable = INTERN) -> int:
+    """
+    Approximate bytes a retained message keeps alive (sys.getsizeof of the dict
+    and its values). Interned strings are skipped: the intern table charges them once.
+    """
+    size = sys.getsizeof(msg)
+    for value in msg.values():
+        if isinstance(value, str) and interns.is_shared(value):
+            continue
+        size += sys.getsizeof(value)
+    return size
+
+
+class Retention:
+    """
+    Keeps a worker's message list within a message count, a per-device byte
+    budget and the global byte budget, dropping the oldest messages first.
+    The newest message is always kept. Callers hold the worker's messages_lock.
+
+    If index_size is set (by SerialManager, to MessageIndex.doc_size), the
+    index's share of every message is charged to the global budget here too, so
+    evicting a message is known to free its index entries as well. It does not
+    count towards the per-device limit.
+    """
+
+    def __init__(
+        self,
+        max_messages: int,
+        max_bytes: int = DEVICE_BYTES,
+        budget: ByteBudget = GLOBAL_BUDGET,
+        interns: InternTable = INTERN,
+    ):
+        self.max_messages = max_messages
+        self.max_bytes = max_bytes
+        self.budget = budget
+        self.interns = interns
+        self.sizes: List[int] = []
+        self.used = 0
+        self.index_size: Optional[Callable[[Dict], int]] = None
+        self.index_sizes: List[int] = []
+        self.index_used = 0
+        self.evicted = 0
+
+    def make_message(self, msg_id: int, src: str, text: str, ts: float) -> Dict:
+        return {"id": msg_id, "src": self.interns.intern(src), "text": self.interns.intern(text), "ts": ts}
+
+    def add(self, messages: List[Dict], msg: Dict):
+        size = message_size(msg, self.interns)
+        index_size = self.index_size(msg) if self.index_size else 0
+        messages.append(msg)
+        self.sizes.append(size)
+        self.index_sizes.append(index_size)
+        self.used += size
+        self.index_used += index_size
+        self.budget.add(size + index_size)
+
+        drop, freed, index_freed = 0, 0, 0
+        count = len(messages)
+        while count - drop > 1 and (
+            count - drop > self.max_messages
+            or self.used - freed > self.max_bytes
+            or self.budget.used - freed - index_freed > self.budget.limit
+        ):
+            freed += self.sizes[drop]
+            index_freed += self.index_sizes[drop]
+            drop += 1
+        if drop:
+            del messages[:drop]
+            del self.sizes[:drop]
+            del self.index_sizes[:drop]
+            self.used -= freed
+            self.index_used -= index_freed
+            self.budget.add(-freed - index_freed)
+            self.evicted += drop
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "messages": len(self.sizes),
+            "bytes": self.used,
+            "bytes_limit": self.max_bytes,
+            "index_bytes": self.index_used,
+            "evicted": self.evicted,
+        }
+
+
+def global_stats(budget: ByteBudget = GLOBAL_BUDGET, interns: InternTable = INTERN) -> Dict:
+    return {"bytes": budget.used, "bytes_limit": budget.limit, "intern": interns.stats()}
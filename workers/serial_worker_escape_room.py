@@ -2,11 +2,14 @@ import os
 import threading
 import time
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 
 import serial
 
 from workers.audio import play_sound_file
+from workers.audio_process import get_audio_engine
+from workers.latency import LatencyProbe
+from workers.retention import Retention
 from workers.serial_utils import BAUD
 
 READY_TOKEN = "ESCAPE:READY"
@@ -14,7 +17,7 @@ ARMED_TOKEN = "ESCAPE:ARMED"
 WIN_TOKEN = "ESCAPE:WIN"
 FAIL_TOKEN = "ESCAPE:FAIL"
 DEFAULT_SOUND_FILE = Path(os.environ.get("ESCAPE_READY_MP3", "letsgo.wav"))
-MAX_MESSAGES = 200
+MAX_MESSAGES = 2000  # count cap; the byte budgets in workers.retention normally bind first
 FAIL_SOUND_FILE = Path(os.environ.get("ESCAPE_FAIL_MP3", "dontangerit.wav"))
 
 
@@ -52,38 +55,55 @@ class EscapeRoomWorker:
         self.ser = ser
         self.sound_hooks = sound_hooks or SOUND_HOOKS
         self.echo_to_console = echo_to_console
+        # set by SerialManager to the unique device name; used to label threads
+        self.device_id = self.default_id
         self.messages: List[Dict[str, str]] = []
         self.messages_lock = threading.Lock()
+        self.retention = Retention(MAX_MESSAGES)
         self.status_lock = threading.Lock()
         self.status = {"ready": False, "armed": False, "win": False, "fail": False}
         self.msg_counter = 0
         self.running = False
         self.thread: Optional[threading.Thread] = None
+        # called with (message, oldest_retained_id) after every append, e.g. by the search index
+        self.message_listener: Optional[Callable[[Dict, int], None]] = None
+        self.write_lock = threading.Lock()
+        self.probe = LatencyProbe(self._write_line)
 
     def start(self):
         if self.running:
             return
         self.running = True
-        self.thread = threading.Thread(target=self._reader_loop, daemon=True)
+        self.thread = threading.Thread(target=self._reader_loop, name=f"{self.device_id}:reader", daemon=True)
         self.thread.start()
+        self.probe.start(name=f"{self.device_id}:latency")
 
     def _reader_loop(self):
         while self.running:
             raw = self.ser.readline()  # blocks until '\n'
+            received_at = time.time()
             if not raw:
                 continue
             line = raw.decode("utf-8", errors="replace").strip()
             if not line:
                 continue
+            # PONG lines are ordinary output unless this host is probing
+            if self.probe.running and self.probe.handle_line(line, received_at):
+                continue
             if self.echo_to_console:
                 print(f"\nESCAPE ESP32: {line}\n> ", end="", flush=True)
             self._trigger_sound_for_token(line)
             self._append_message("ESP32", line)
 
     def send_line(self, line: str):
-        self.ser.write((line.strip() + "\n").encode("utf-8"))
+        self._write_line(line.strip())
         self._append_message("HOST", line.strip())
 
+    def _write_line(self, line: str):
+        # the latency probe writes from its own thread
+        with self.write_lock:
+            self.ser.write((line + "\n").encode("utf-8"))
+
     def _trigger_sound_for_token(self, token: str):
         path = self.sound_hooks.get(token)
         if not path:
@@ -91,14 +111,19 @@ class EscapeRoomWorker:
         self._play_sound_file(path)
 
     def _play_sound_file(self, path: Path):
-        threading.Thread(target=play_sound_file, args=(path,), daemon=True).start()
+        engine = get_audio_engine()
+        if engine:
+            engine.play(path)
+            return
+        threading.Thread(target=play_sound_file, args=(path,), name=f"{self.device_id}:audio", daemon=True).start()
 
     def _append_message(self, src: str, text: str):
         with self.messages_lock:
             self.msg_counter += 1
-            self.messages.append({"id": self.msg_counter, "src": src, "text": text, "ts": time.time()})
-            if len(self.messages) > MAX_MESSAGES:
-                del self.messages[:-MAX_MESSAGES]
+            msg = self.retention.make_message(self.msg_counter, src, text, time.time())
+            self.retention.add(self.messages, msg)
+            if self.message_listener:
+                self.message_listener(msg, self.messages[0]["id"])
         self._update_status(text)
 
     def _update_status(self, token: str):
@@ -114,9 +139,20 @@ class EscapeRoomWorker:
             elif token == FAIL_TOKEN:
                 self.status["fail"] = True
 
-    def get_status(self) -> Dict[str, bool]:
+    def get_status(self) -> Dict[str, object]:
         with self.status_lock:
-            return dict(self.status)
+            status: Dict[str, object] = dict(self.status)
+        if self.probe.running:
+            status["latency"] = self.probe.get_stats()
+        return status
+
+    def get_metrics(self) -> Dict:
+        with self.messages_lock:
+            memory = self.retention.stats()
+        metrics: Dict = {"messages": self.msg_counter, "memory": memory}
+        if self.probe.running:
+            metrics["latency"] = self.probe.get_stats()
+        return metrics
 
     def get_messages(self) -> List[Dict[str, str]]:
         with self.messages_lock:
@@ -130,6 +166,7 @@ class EscapeRoomWorker:
 
     def close(self):
         self.running = False
+        self.probe.stop()
         try:
             self.ser.close()
         except Exception: